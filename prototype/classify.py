@@ -29,11 +29,24 @@ def classify(player_hand: Counter) -> Tuple[Counter]:
     True
     """
 
-    return (player_hand & tiles.FILTER_CHARACTERS,
-            player_hand & tiles.FILTER_CIRCLES,
-            player_hand & tiles.FILTER_BAMBOOS,
-            player_hand & tiles.FILTER_WINDS,
-            player_hand & tiles.FILTER_DRAGONS)
+    # The same as player_hand & tiles.FILTER_CHARACTERS etc. in one pass
+    result = (Counter(), Counter(), Counter(), Counter(), Counter())
+    start = tiles.TILE_RANGE.start
+    for tile, count in player_hand.items():
+        if count > 0:
+            result[_CLASSIFY_INDEX[tile - start]][tile] = min(count, 4)
+
+    return result
+
+
+# Indices to the result of classify, by tile - TILE_RANGE.start
+_CLASSIFY_INDEX = tuple(
+    0 if tiles.is_character(tile)
+    else 1 if tiles.is_circle(tile)
+    else 2 if tiles.is_bamboo(tile)
+    else 3 if tiles.is_wind(tile)
+    else 4
+    for tile in tiles.TILE_RANGE)
 
 
 # the 36 tiles of the same suit
@@ -33,6 +33,9 @@ class Game:
         self.current_phase = None
         self.wall_agent = TileWallAgent()
 
+        # PlayerHand instances released by cleanup_phase() for reuse
+        self._free_hands = []
+
     def __str__(self):
         output = [f'{self.game_type.value}']
         if self.current_phase:
@@ -115,7 +118,7 @@ class Game:
         while True:
             player_hands = self.rebuild_walls()
             for player, hand in zip(self.players, player_hands):
-                player.hand = PlayerHand(hand)
+                player.hand = self._new_hand(hand)
 
             # TODO: something interaction
 
@@ -159,9 +162,22 @@ class Game:
         """Clean up e.g. 東一局一本場"""
 
         for player in self.players:
+            if player.hand:
+                self._free_hands.append(player.hand)
             player.hand = None
 
 
+    def _new_hand(self, concealed):
+        """Return a PlayerHand, reusing a released one if any."""
+
+        if self._free_hands:
+            player_hand = self._free_hands.pop()
+            player_hand.reset(concealed)
+            return player_hand
+
+        return PlayerHand(concealed)
+
+
     def rotate_seat_winds(self, phase):
         """Rotate seat winds if needed, i.e. S, W, N, E = E, S, W, N.
         """
@@ -7,22 +7,36 @@ tiles all of the same suit, in numerical sequence)>(Mahjong - Wikipedia)
 """
 
 from collections import Counter
-from enum import Enum
-from typing import Tuple
+from enum import IntEnum
+from typing import Iterable, List, Tuple
 
 import tiles
 
-class DiscardedBy(Enum):
+class DiscardedBy(IntEnum):
     """Positions of the player that discarded the tile claimed"""
 
-    LEFT = '上家'
-    CENTER = '対面'
-    RIGHT = '下家'
+    LEFT = 0
+    CENTER = 1
+    RIGHT = 2
+
+    def __str__(self) -> str:
+        """Return informal representation
+
+        >>> print(DiscardedBy.LEFT)
+        上家
+        >>> print(DiscardedBy.CENTER)
+        対面
+        >>> print(DiscardedBy.RIGHT)
+        下家
+        """
+        return ('上家', '対面', '下家')[self.value]
 
 
 class Meld:
     """Base class"""
 
+    __slots__ = ('tileinfo', 'concealed', 'discarded_by')
+
     def __init__(self, tileinfo, concealed: bool, discarded_by: DiscardedBy):
         self.tileinfo = tileinfo
         self.concealed = concealed
@@ -35,6 +49,8 @@ class Meld:
 class Chow(Meld):
     """Chow"""
 
+    __slots__ = ()
+
     def __init__(self, tileinfo, concealed: bool):
         super().__init__(tileinfo, concealed, DiscardedBy.LEFT)
 
@@ -48,6 +64,8 @@ class Chow(Meld):
 class Pung(Meld):
     """Pung"""
 
+    __slots__ = ()
+
     _minipoints_base = 2
 
     @property
@@ -68,6 +86,8 @@ class Pung(Meld):
 class Kong(Pung):
     """Kong"""
 
+    __slots__ = ()
+
     _minipoints_base = 8
 
 
@@ -81,6 +101,26 @@ def is_pair_eyes(pair: Counter) -> bool:
     return len(pair) == 1 and sum(pair.values()) == 2
 
 
+def _subtract_items(player_hand: Counter, items: Tuple) -> None:
+    """Subtract (tile, count) pairs from ``player_hand`` in place.
+
+    A tile whose count drops to zero is deleted. Unlike ``Counter.__isub__``,
+    the other entries are left as they are, even if zero or negative; the
+    callers subtract only what the hand holds.
+
+    >>> hand = Counter({1: 1, 2: 2, 3: 0})
+    >>> _subtract_items(hand, ((1, 1), (2, 1)))
+    >>> hand
+    Counter({2: 1, 3: 0})
+    """
+
+    for k, v in items:
+        if player_hand[k] == v:
+            del player_hand[k]
+        else:
+            player_hand[k] -= v
+
+
 def remove_melds(player_hand: Counter, all_melds: Tuple) -> Tuple[Counter]:
     """Remove some melds from player's hand.
 
@@ -98,20 +138,7 @@ def remove_melds(player_hand: Counter, all_melds: Tuple) -> Tuple[Counter]:
     (Counter({1: 1, 2: 1, 3: 1}), Counter({1: 1, 2: 1, 3: 1}))
     """
 
-    remains = sum(player_hand.values())
-    melds = []
-    for meld in all_melds:
-        while player_hand & meld == meld:
-            player_hand -= meld
-            remains -= 3
-            melds.append(meld)
-            if remains < 3:
-                break
-
-        if remains < 3:
-            break
-
-    return tuple(melds)
+    return tuple(_remove_all(player_hand, all_melds, 3))
 
 
 def remove_pairs(player_hand: Counter, all_pairs: Tuple) -> Tuple[Counter]:
@@ -130,17 +157,72 @@ def remove_pairs(player_hand: Counter, all_pairs: Tuple) -> Tuple[Counter]:
     (Counter({5: 2}), Counter({6: 2}))
     """
 
+    return tuple(_remove_all(player_hand, all_pairs, 2))
+
+
+def _remove_all(player_hand: Counter, candidates: Tuple,
+                size: int) -> List[Counter]:
+    """Remove the candidates of ``size`` tiles greedily from player's hand.
+
+    Return the candidates removed.
+    """
+
     remains = sum(player_hand.values())
-    pairs = []
-    for pair in all_pairs:
-        while player_hand & pair == pair:
-            player_hand -= pair
-            remains -= 2
-            pairs.append(pair)
-            if remains < 2:
+    removed = []
+    for candidate in candidates:
+        if remains < size:
+            break
+
+        items = tuple(candidate.items())
+        while all(player_hand[k] >= v for k, v in items):
+            _subtract_items(player_hand, items)
+            remains -= size
+            removed.append(candidate)
+            if remains < size:
                 break
 
-        if remains < 2:
-            break
+    return removed
+
+
+def as_patterns(melds: Iterable[Counter], base: int = 1) -> Tuple:
+    """Convert melds or pairs to patterns for ``remove_patterns``.
+
+    A pattern is a tuple of (index, count) pairs, where an index is a key of
+    the Counter minus ``base``.
+
+    >>> as_patterns([Counter([1, 2, 3]), Counter({9: 3})])
+    (((0, 1), (1, 1), (2, 1)), ((8, 3),))
+    """
+
+    return tuple(tuple((k - base, v) for k, v in meld.items())
+                 for meld in melds)
+
+
+MELD_PATTERNS_NUMBER = as_patterns(tiles.MELDS_NUMBER)
+PAIR_PATTERNS_NUMBER = as_patterns(tiles.PAIRS_NUMBER)
+
+
+def remove_patterns(counts: List[int], patterns: Tuple) -> int:
+    """Remove patterns from a list of counts greedily in place.
+
+    This is ``remove_melds`` and ``remove_pairs`` for a list of counts, where
+    ``counts[i]`` is the count of the number ``i + 1``. Return the number of
+    the patterns removed.
+
+    >>> counts = [1, 1, 2, 2, 2, 0, 0, 0, 0]
+    >>> remove_patterns(counts, MELD_PATTERNS_NUMBER)
+    2
+    >>> counts
+    [0, 0, 0, 1, 1, 0, 0, 0, 0]
+    >>> remove_patterns(counts, PAIR_PATTERNS_NUMBER)
+    1
+    """
+
+    num_removed = 0
+    for pattern in patterns:
+        while all(counts[i] >= n for i, n in pattern):
+            for i, n in pattern:
+                counts[i] -= n
+            num_removed += 1
 
-    return tuple(pairs)
+    return num_removed
@@ -5,6 +5,7 @@ mahjong.playerhand
 """
 
 from collections import Counter
+from itertools import chain
 
 from melds import (DiscardedBy, Chow, Pung, Kong)
 from shanten import (
@@ -19,32 +20,45 @@ class PlayerHand:
     """Player's hand."""
 
     def __init__(self, concealed, exposed=None, initial_update=True):
-        if isinstance(concealed, str):
-            concealed = tiles.tiles(concealed)
+        # Bumped on every change of the state; keys the caches below.
+        self._version = 0
+        self._str_cache = (None, -1)
+        self._shanten_version = -1
 
-        if isinstance(concealed, Counter):
-            self._concealed = concealed
-        else:
-            self._concealed = Counter(concealed)
-        self._exposed = exposed or []
+        self.reset(concealed, exposed, initial_update)
 
-        self.claimable_chow = {}
-        self.claimable_pung = {}
-        self.claimable_kong = {}
-        self.claimable_win = {}
-
-        self.shanten_std, self.shanten_7, self.shanten_13 = None, None, None
-        if initial_update:
-            self.update()
+    def __str__(self):
+        """Return informal representation
+
+        >>> hand = PlayerHand('123m東東東南南西西北北白')
+        >>> print(hand)
+        1m2m3m東東東南南西西北北白  1 シャンテン
+        >>> hand.commit_pung(tiles.tiles('北'), DiscardedBy.CENTER)
+        >>> hand.update()
+        >>> print(hand) # doctest: +ELLIPSIS
+        1m2m3m東東東南南西西白 Pung(...) 0 シャンテン
+        """
 
+        text, version = self._str_cache
+        if version == self._version:
+            return text
 
-    def __str__(self):
         # concealed part
-        concealed_part = tiles.format_tiles(self.concealed_part.elements())
+        concealed_part = tiles.format_counter(self.concealed_part)
 
         # exposed part
         exposed_part = ' '.join(str(meld) for meld in self.exposed_parts)
-        return f'{concealed_part} {exposed_part} {self.shanten} シャンテン'
+        text = f'{concealed_part} {exposed_part} {self.shanten} シャンテン'
+        self._str_cache = (text, self._version)
+        return text
+
+    def _touch(self):
+        """Mark the internal state as modified."""
+        self._version += 1
+
+    def _remove_concealed(self, tile: tiles.Tile, num: int = 1):
+        """Remove ``num`` copies of ``tile`` from the concealed part."""
+        self._concealed[tile] -= num
 
 
     @property
@@ -70,7 +84,30 @@ class PlayerHand:
 
     @property
     def shanten(self):
-        """Return the shanten number"""
+        """Return the shanten number
+
+        The shanten numbers are computed on the first access after the hand
+        has changed.
+
+        >>> hand = PlayerHand('123m東東東南南西西北北白')
+        >>> hand.shanten_std is None
+        True
+        >>> hand.shanten
+        1
+        >>> hand.shanten_std
+        1
+
+        They are computed again after the hand is changed and updated.
+
+        >>> hand.concealed_part[tiles.tiles('白')] -= 1
+        >>> hand.concealed_part[tiles.tiles('北')] += 1
+        >>> hand.update()
+        >>> hand.shanten
+        0
+        """
+        if self._shanten_version != self._version:
+            self.update_shanten()
+
         if not self.is_concealed:
             return self.shanten_std
 
@@ -102,9 +139,29 @@ class PlayerHand:
         >>> all(PlayerHand('1112345678999s').can_claim_chow(
         ...     tiles.tiles('{}s'.format(i))) for i in range(1, 10))
         True
+
+        >>> PlayerHand('78p東南').can_claim_chow(0x1F022)
+        False
+
+        As with ``claimable_chow``, the answer changes after ``update()``.
+
+        >>> hand = PlayerHand('12m東南')
+        >>> hand.commit_chow(tiles.tiles('3m'), tiles.tiles('1m'),
+        ...                  tiles.tiles('2m'))
+        >>> hand.can_claim_chow(tiles.tiles('3m'))
+        True
+        >>> hand.update()
+        >>> hand.can_claim_chow(tiles.tiles('3m'))
+        False
         """
 
-        return discarded_tile in self.claimable_chow
+        # Honors lie below the Suits in the tile ID space and never make a Chow.
+        offset = discarded_tile - tiles.TILE_ONE_OF_CHARACTERS
+        if not 0 <= offset < 27:
+            return False
+
+        suit, number = divmod(offset, 9)
+        return bool(_get_chow_mask(self._suit_masks[suit]) >> number & 1)
 
     def can_claim_pung(self, discarded_tile: tiles.Tile):
         """Test if the player can claim for a Pung.
@@ -160,7 +217,7 @@ class PlayerHand:
         >>> chow.concealed
         False
         >>> print(chow.discarded_by)
-        DiscardedBy.LEFT
+        上家
         >>> player_hand.concealed_part[tile1]
         1
         >>> player_hand.concealed_part[target_tile]
@@ -170,7 +227,9 @@ class PlayerHand:
         """
 
         self.exposed_parts.append(Chow([new_tile, tile1, tile2], False))
-        self.concealed_part.subtract([tile1, tile2])
+        self._remove_concealed(tile1)
+        self._remove_concealed(tile2)
+        self._touch()
         # self.update()
 
     def commit_pung(self, tile: tiles.Tile, discarded_by: DiscardedBy):
@@ -185,13 +244,15 @@ class PlayerHand:
         >>> pung.concealed
         False
         >>> print(pung.discarded_by)
-        DiscardedBy.CENTER
+        対面
         >>> player_hand.concealed_part[target_tile]
         0
         """
 
         self.exposed_parts.append(Pung(tile, False, discarded_by))
-        self.concealed_part.subtract({tile: 2})
+        self._exposed_pung_tiles.add(tile)
+        self._remove_concealed(tile, 2)
+        self._touch()
         # self.update()
 
     def commit_kong(self, tile: tiles.Tile, discarded_by: DiscardedBy):
@@ -208,7 +269,12 @@ class PlayerHand:
         Counter()
         >>> kong = hand.exposed_parts[-1]
         >>> print(kong.discarded_by)
-        DiscardedBy.CENTER
+        対面
+
+        >>> hand = PlayerHand(tiles.tiles('479m378p568s東東東白'))
+        >>> hand.commit_kong(tiles.tiles('東'), DiscardedBy.LEFT)
+        >>> print(hand.exposed_parts[-1].discarded_by)
+        上家
 
         Example 2: 暗槓
 
@@ -231,37 +297,128 @@ class PlayerHand:
         >>> kong.tileinfo == tiles.tiles('東')
         True
         >>> print(kong.discarded_by)
-        DiscardedBy.RIGHT
+        下家
         """
 
-        if discarded_by:
+        if discarded_by is not None:
             # A melded Kong
             self.exposed_parts.append(Kong(tile, False, discarded_by))
-            self.concealed_part.subtract({tile: 3})
-        elif self.concealed_part.get(tile, 0) == 4:
+            self._remove_concealed(tile, 3)
+        elif self.concealed_part[tile] == 4:
             # A concealed Kong
             self.exposed_parts.append(Kong(tile, True, None))
-            self.concealed_part.subtract({tile: 4})
-        else:
+            self._remove_concealed(tile, 4)
+        elif tile in self._exposed_pung_tiles:
             # A melded Pung is extended to a melded Kong
             for i, meld in enumerate(self.exposed_parts):
                 if meld.tileinfo == tile:
                     self._exposed[i] = meld.extend_to_kong()
                     break
+            self._exposed_pung_tiles.discard(tile)
+        self._touch()
 
         # Note: リンシャンから補充するまで self.update_shanten() を呼べない
         # self.update()
 
+    def reset(self, concealed, exposed=None, initial_update=True):
+        """Reuse this instance for a new hand.
+
+        ``__init__`` sets up the hand through this method. The concealed part
+        and the exposed melds are replaced, not cleared, so the objects of the
+        old hand are left intact.
+
+        >>> hand = PlayerHand('123m東東東南南西西北北白')
+        >>> hand.commit_pung(tiles.tiles('北'), DiscardedBy.CENTER)
+        >>> hand.reset('123m東東東南南西西北北中')
+        >>> hand.exposed_parts
+        []
+        >>> hand.concealed_part[tiles.tiles('北')]
+        2
+        >>> hand.shanten
+        1
+
+        A hand can be reset with its own concealed part.
+
+        >>> concealed_part = hand.concealed_part
+        >>> hand.reset(concealed_part)
+        >>> hand.concealed_part == concealed_part
+        True
+        >>> sum(hand.concealed_part.values())
+        13
+        """
+
+        if isinstance(concealed, str):
+            concealed = tiles.tiles(concealed)
+
+        if isinstance(concealed, Counter):
+            self._concealed = concealed
+        else:
+            self._concealed = Counter(concealed)
+        self._exposed = exposed or []
+        # Tiles of the exposed Pungs that may be extended to Kongs
+        self._exposed_pung_tiles = _get_pung_tiles(self._exposed)
+
+        self.claimable_chow = frozenset()
+        self.claimable_pung = frozenset()
+        self.claimable_kong = frozenset()
+        self.claimable_win = frozenset()
+
+        # 9-bit presence masks of the Suit tiles in the ID order, i.e.
+        # Characters, Bamboos and Circles
+        self._suit_masks = [0, 0, 0]
+
+        self.shanten_std, self.shanten_7, self.shanten_13 = None, None, None
+        self._touch()
+
+        if initial_update:
+            self.update()
+
     def update(self):
-        """Update internal state"""
+        """Update internal state
+
+        Call this after changing ``concealed_part`` directly; the cached text
+        and shanten numbers are dropped here. The shanten numbers are left to
+        the ``shanten`` property.
+
+        >>> hand = PlayerHand('123m東東東南南西西北北白')
+        >>> print(hand)
+        1m2m3m東東東南南西西北北白  1 シャンテン
+        >>> hand.concealed_part[tiles.tiles('白')] -= 1
+        >>> hand.concealed_part[tiles.tiles('北')] += 1
+        >>> hand.update()
+        >>> print(hand)
+        1m2m3m東東東南南西西北北北  0 シャンテン
+        """
+        self._touch()
         self.update_claimable_tiles()
-        self.update_shanten()
 
     def update_claimable_tiles(self):
-        """WIP"""
+        """Update information for claiming a Chow, a Pung and a Kong.
+
+        >>> player_hand = PlayerHand('2457m3368p38s発発発', initial_update=False)
+        >>> player_hand.update_claimable_tiles()
+        >>> set(tiles.tiles('36m7p')) == player_hand.claimable_chow
+        True
+        >>> set(tiles.tiles('3p発')) == player_hand.claimable_pung
+        True
+        >>> {tiles.tiles('発')} == player_hand.claimable_kong
+        True
+        """
+
+        claimable_pung = []
+        claimable_kong = []
+        for tile, count in self.concealed_part.items():
+            if count >= 2:
+                claimable_pung.append(tile)
+                if count >= 3:
+                    claimable_kong.append(tile)
+
+        # 加槓
+        claimable_kong.extend(self._exposed_pung_tiles)
+
         self.update_claimable_tiles_chow()
-        self.update_claimable_tiles_pung()
-        self.update_claimable_tiles_kong()
+        self.claimable_pung = frozenset(claimable_pung)
+        self.claimable_kong = frozenset(claimable_kong)
 
     def update_claimable_tiles_chow(self):
         """Update information for claiming a Chow.
@@ -270,29 +427,21 @@ class PlayerHand:
         >>> player_hand.update_claimable_tiles_chow()
         >>> set(tiles.tiles('234567p')) == player_hand.claimable_chow
         True
-        """
 
-        def _find_mate_pairs(suits, part):
-            def _get_mate_pair(tile):
-                yield (tile - 2, tile - 1)
-                yield (tile - 1, tile + 1)
-                yield (tile + 1, tile + 2)
+        ``can_claim_chow`` agrees with ``claimable_chow`` after this.
 
-            # XXX: 以下のループをなぜか comprehension で書けない？
-            for tile in suits:
-                if any(mate[0] in part and mate[1] in part
-                       for mate in _get_mate_pair(tile)):
-                    claimable_chow.add(tile)
-
-        claimable_chow = set()
-        _find_mate_pairs(tiles.TILE_RANGE_CHARACTERS,
-                         self.concealed_part & tiles.FILTER_CHARACTERS)
-        _find_mate_pairs(tiles.TILE_RANGE_CIRCLES,
-                         self.concealed_part & tiles.FILTER_CIRCLES)
-        _find_mate_pairs(tiles.TILE_RANGE_BAMBOOS,
-                         self.concealed_part & tiles.FILTER_BAMBOOS)
+        >>> player_hand.concealed_part[tiles.tiles('4m')] += 1
+        >>> player_hand.update_claimable_tiles_chow()
+        >>> player_hand.can_claim_chow(tiles.tiles('3m'))
+        True
+        >>> all(player_hand.can_claim_chow(tile)
+        ...     == (tile in player_hand.claimable_chow) for tile in tiles.TILE_RANGE)
+        True
+        """
 
-        self.claimable_chow = claimable_chow
+        # Keep can_claim_chow in step with claimable_chow.
+        self._suit_masks = suit_masks = _get_suit_masks(self.concealed_part)
+        self.claimable_chow = frozenset(_get_chow_tiles(suit_masks))
 
     def update_claimable_tiles_pung(self):
         """Update information for claiming a Pung.
@@ -304,7 +453,7 @@ class PlayerHand:
         """
 
         counter = self.concealed_part
-        self.claimable_pung = set(
+        self.claimable_pung = frozenset(
             tile for tile in counter if counter[tile] >= 2)
 
     def update_claimable_tiles_kong(self):
@@ -314,18 +463,21 @@ class PlayerHand:
         >>> player_hand.update_claimable_tiles_kong()
         >>> set(tiles.tiles('3p発')) == player_hand.claimable_kong
         True
+
+        >>> player_hand = PlayerHand(
+        ...     '26m3368p38s発発発', [Pung(tiles.tiles('東'), False, None)])
+        >>> player_hand.update_claimable_tiles_kong()
+        >>> set(tiles.tiles('東発')) == player_hand.claimable_kong
+        True
         """
 
         counter = self.concealed_part
 
-        # 大明槓 or 暗槓
-        self.claimable_kong = set(
-            tile for tile in counter if counter[tile] in (3, 4))
-
-        # 加槓
-        self.claimable_kong.union(
-            meld.tileinfo for meld in self.exposed_parts
-            if isinstance(meld, Pung))
+        self.claimable_kong = frozenset(chain(
+            # 大明槓 or 暗槓
+            (tile for tile in counter if counter[tile] in (3, 4)),
+            # 加槓
+            self._exposed_pung_tiles))
 
     def update_shanten(self):
         """Update the shanten number"""
@@ -339,6 +491,72 @@ class PlayerHand:
             self.shanten_7 = None
             self.shanten_13 = None
 
+        self._shanten_version = self._version
+
+
+def _get_pung_tiles(melds):
+    """Return the set of the tiles of the Pungs (not Kongs) in ``melds``.
+
+    >>> _get_pung_tiles([Pung(1, False, None), Kong(2, False, None)])
+    {1}
+    """
+
+    return {meld.tileinfo for meld in melds if type(meld) is Pung}
+
+
+def _get_suit_masks(player_hand: Counter):
+    """Return the 9-bit presence masks of the three Suits in ``player_hand``.
+
+    Bit ``n`` of the ``i``-th mask is set if the hand holds the tile
+    ``TILE_ONE_OF_CHARACTERS + 9 * i + n``.
+
+    >>> [bin(mask) for mask in _get_suit_masks(Counter(tiles.tiles('129m東')))]
+    ['0b100000011', '0b0', '0b0']
+    """
+
+    suit_masks = [0, 0, 0]
+    for tile, count in player_hand.items():
+        if count > 0 and tile >= tiles.TILE_ONE_OF_CHARACTERS:
+            suit, number = divmod(tile - tiles.TILE_ONE_OF_CHARACTERS, 9)
+            suit_masks[suit] |= 1 << number
+
+    return suit_masks
+
+
+def _get_chow_mask(mask: int) -> int:
+    """Return the mask of the numbers that make a Chow with ``mask``.
+
+    Bit ``n`` stands for the number ``n + 1`` of a suit.
+
+    >>> bin(_get_chow_mask(0b11))
+    '0b100'
+    >>> bin(_get_chow_mask(0b1010))
+    '0b100'
+    >>> bin(_get_chow_mask(0b110000000))
+    '0b1000000'
+    """
+
+    # Mates on the left side (n - 2, n - 1) and right side (n + 1, n + 2)
+    left1, left2 = mask << 1, mask << 2
+    right1, right2 = mask >> 1, mask >> 2
+    return (left2 & left1 | left1 & right1 | right1 & right2) & 0x1FF
+
+
+def _get_chow_tiles(suit_masks):
+    """Generate the Suit tiles that make a Chow with the tiles in hand.
+
+    Bit ``n`` of ``suit_masks[i]`` represents that the hand holds the tile
+    ``TILE_ONE_OF_CHARACTERS + 9 * i + n``.
+
+    >>> [hex(t) for t in _get_chow_tiles([0b11, 0, 0b101000000])]
+    ['0x1f009', '0x1f020']
+    """
+
+    for suit, mask in enumerate(suit_masks):
+        chow_mask = _get_chow_mask(mask)
+        base = tiles.TILE_ONE_OF_CHARACTERS + 9 * suit
+        yield from (base + n for n in range(9) if chow_mask >> n & 1)
+
 
 def main():
     """test"""
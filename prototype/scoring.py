@@ -2,21 +2,28 @@
 """
 
 from collections import Counter
+from typing import List
 
-from melds import is_pair_eyes, remove_melds, remove_pairs
+from melds import (
+    MELD_PATTERNS_NUMBER, PAIR_PATTERNS_NUMBER,
+    remove_patterns)
 import tiles
 from winds import Winds
 
 
+# Winds indexed by tile - TILE_RANGE.start, i.e. tile - TILE_EAST_WIND
+_WIND_OF_TILE = (Winds.EAST, Winds.SOUTH, Winds.WEST, Winds.NORTH)
+
+
+# 1 for Terminals and Honors, 0 for Simples, indexed by tile - TILE_RANGE.start
+_NOT_SIMPLE = tuple(int(not tiles.is_simple(tile)) for tile in tiles.TILE_RANGE)
+
+
 def _compute_minipoints_meld(tile: tiles.Tile, concealed: bool, value: int) -> int:
     """A helper function"""
 
-    if not tiles.is_simple(tile):
-        value <<= 1
-    if concealed:
-        value <<= 1
-
-    return value
+    # Doubled for a Terminal or an Honor, and doubled again if concealed
+    return value << (concealed + _NOT_SIMPLE[tile - tiles.TILE_RANGE.start])
 
 
 def compute_minipoints_pung(tile: tiles.Tile, concealed: bool) -> int:
@@ -77,22 +84,15 @@ def compute_minipoints_eyes(
     0
     """
 
-    if tiles.is_dragon(tile):
-        return 2
-
-    if not tiles.is_wind(tile):
+    offset = tile - tiles.TILE_RANGE.start
+    if offset < len(_WIND_OF_TILE):
+        wind = _WIND_OF_TILE[offset]
+        if wind == seat_wind or wind == prevalent_wind:
+            return 2
         return 0
 
-    wind_mapping = {
-        tiles.TILE_EAST_WIND: Winds.EAST,
-        tiles.TILE_SOUTH_WIND: Winds.SOUTH,
-        tiles.TILE_WEST_WIND: Winds.WEST,
-        tiles.TILE_NORTH_WIND: Winds.NORTH,}
-
-    if wind_mapping[tile] in (seat_wind, prevalent_wind):
-        return 2
-
-    return 0
+    # The rest of the Honors are Dragons.
+    return 2 if tiles.TILE_CLASS_TABLE[offset] is tiles.TileClass.HONOR else 0
 
 
 def compute_minipoints_winning(
@@ -129,28 +129,47 @@ def compute_minipoints_winning(
     if sum(concealed_part.values()) == 1:
         return 2
 
-    tile_class = tiles.get_tile_class(winning_tile)
-    if tile_class == tiles.TileClass.HONOR:
+    tile_class = tiles.TILE_CLASS_TABLE[winning_tile - tiles.TILE_RANGE.start]
+    if tile_class is tiles.TileClass.HONOR:
         # single wait (2) or twin Pungs (0)
         return 2 if concealed_part[winning_tile] == 1 else 0
 
     # Hereafter case of Suits
 
-    hand_part = Counter({(k - tiles.TILE_ONE_OF_CHARACTERS) % 9 + 1: v
-                         for k, v in concealed_part.items()
-                         if tiles.get_tile_class(k) == tile_class})
+    # The counts of the numbers 1 to 9 in the suit of the winning tile
+    counts = [0] * 9
+    for k, v in concealed_part.items():
+        if tiles.TILE_CLASS_TABLE[k - tiles.TILE_RANGE.start] is tile_class:
+            counts[(k - tiles.TILE_ONE_OF_CHARACTERS) % 9] += v
 
     wintilenum = (winning_tile - tiles.TILE_ONE_OF_CHARACTERS) % 9 + 1
-    if is_edge_wait(hand_part, wintilenum):
+    if _is_edge_wait(counts, wintilenum):
         return 2
-    if is_closed_wait(hand_part, wintilenum):
+    if _is_closed_wait(counts, wintilenum):
         return 2
-    if is_single_wait(hand_part, wintilenum):
+    if _is_single_wait(counts, wintilenum):
         return 2
 
     return 0
 
 
+def _to_counts(player_hand: Counter) -> List[int]:
+    """Return the counts of the numbers 1 to 9 in a Counter."""
+    return [player_hand[num] for num in range(1, 10)]
+
+
+# Terminal serial pairs (12 and 89) as patterns, keyed by the number of the
+# winning tile
+_TERMINAL_SERIAL_PAIRS = {3: ((0, 1), (1, 1)), 7: ((7, 1), (8, 1))}
+
+# Separated serial pairs and the Chows they make as patterns, keyed by the
+# number of the winning tile
+_CLOSED_PAIRS_AND_MELDS = {
+    num: (((num - 2, 1), (num, 1)),
+          ((num - 2, 1), (num - 1, 1), (num, 1)))
+    for num in range(2, 9)}
+
+
 def is_edge_wait(player_hand: Counter, winning_tile: tiles.Tile) -> bool:
     """Determine if an edge wait holds.
 
@@ -181,14 +200,17 @@ def is_edge_wait(player_hand: Counter, winning_tile: tiles.Tile) -> bool:
     False
     """
 
-    if winning_tile == 7:
-        terminal_serial_pair = Counter((8, 9))
-    elif winning_tile == 3:
-        terminal_serial_pair = Counter((1, 2))
-    else:
+    return _is_edge_wait(_to_counts(player_hand), winning_tile)
+
+
+def _is_edge_wait(counts: List[int], winning_tile: int) -> bool:
+    """is_edge_wait for the counts of the numbers 1 to 9."""
+
+    terminal_serial_pair = _TERMINAL_SERIAL_PAIRS.get(winning_tile)
+    if terminal_serial_pair is None:
         return False
 
-    return _is_pair_wait_common(player_hand, terminal_serial_pair)
+    return _is_pair_wait_common(counts, terminal_serial_pair)
 
 
 def is_closed_wait(player_hand: Counter, winning_tile: tiles.Tile) -> bool:
@@ -216,12 +238,17 @@ def is_closed_wait(player_hand: Counter, winning_tile: tiles.Tile) -> bool:
     True
     """
 
-    if winning_tile in (1, 9):
+    return _is_closed_wait(_to_counts(player_hand), winning_tile)
+
+
+def _is_closed_wait(counts: List[int], winning_tile: int) -> bool:
+    """is_closed_wait for the counts of the numbers 1 to 9."""
+
+    closed_pair_and_meld = _CLOSED_PAIRS_AND_MELDS.get(winning_tile)
+    if closed_pair_and_meld is None:
         return False
 
-    closed_pair = Counter((winning_tile - 1, winning_tile + 1))
-    meld = Counter(range(winning_tile - 1, winning_tile + 2))
-    return _is_pair_wait_common(player_hand, closed_pair, meld)
+    return _is_pair_wait_common(counts, *closed_pair_and_meld)
 
 
 def is_single_wait(player_hand: Counter, winning_tile: tiles.Tile) -> bool:
@@ -252,29 +279,41 @@ def is_single_wait(player_hand: Counter, winning_tile: tiles.Tile) -> bool:
     if winning_tile not in player_hand:
         return False
 
-    remains = player_hand - Counter((winning_tile,))
-    remove_melds(remains, tiles.MELDS_NUMBER)
-    if remains:
+    return _is_single_wait(_to_counts(player_hand), winning_tile)
+
+
+def _is_single_wait(counts: List[int], winning_tile: int) -> bool:
+    """is_single_wait for the counts of the numbers 1 to 9."""
+
+    if not counts[winning_tile - 1]:
         return False
 
-    return True
+    counts = counts[:]
+    counts[winning_tile - 1] -= 1
+    remove_patterns(counts, MELD_PATTERNS_NUMBER)
+    return not any(counts)
 
 
-def _is_pair_wait_common(player_hand: Counter, testing_pair: Counter, meld=None) -> bool:
+def _is_pair_wait_common(counts: List[int], testing_pair, meld=None) -> bool:
     """Test if a specific pair wait holds.
+
+    ``counts`` is the counts of the numbers 1 to 9 and is left untouched.
+    ``testing_pair`` and ``meld`` are patterns as ``melds.as_patterns`` makes.
     """
 
-    if player_hand & testing_pair != testing_pair:
-        return False
+    counts = counts[:]
+    for i, n in testing_pair:
+        if counts[i] < n:
+            return False
+        counts[i] -= n
 
-    remains = player_hand - testing_pair
     if meld:
-        while remains & meld == meld:
-            remains -= meld
+        remove_patterns(counts, (meld,))
 
-    remove_melds(remains, tiles.MELDS_NUMBER)
-    pairs = remove_pairs(remains, tiles.PAIRS_NUMBER)
-    if remains or (len(pairs) == 1 and not is_pair_eyes(pairs[0])):
+    remove_patterns(counts, MELD_PATTERNS_NUMBER)
+    has_eyes = 2 in counts
+    num_pairs = remove_patterns(counts, PAIR_PATTERNS_NUMBER)
+    if any(counts) or (num_pairs == 1 and not has_eyes):
         return False
 
     return True
@@ -286,30 +325,20 @@ def compute_minipoints(
         waiting_bonus: bool,
         concealed_melds, exposed_melds) -> int:
     """Compute minipoints from a winning hand.
+
+    >>> from melds import Chow
+    >>> compute_minipoints(False, False, False, [], [])
+    25
+    >>> compute_minipoints(True, False, False, [Chow([1, 2, 3], True)], [])
+    32
+    >>> compute_minipoints(False, True, True, [], [Chow([1, 2, 3], False)])
+    24
     """
 
     if not concealed_melds and not exposed_melds:
         # Regard as Seven Pairs
         return 25
 
-    total_minipoints = 0
-
-    # 副底
-    if not exposed_melds:
-        total_minipoints += 30
-    else:
-        total_minipoints += 20
-
-    # ツモ 2 符
-    if self_draw_bonus:
-        total_minipoints += 2
-
-    # 雀頭 2 符
-    if eyes_bonus:
-        total_minipoints += 23457
-
-    # 愚形待ち 2 符
-    if waiting_bonus:
-        total_minipoints += 2
-
-    return total_minipoints
+    # 副底 plus 2 each for ツモ, 雀頭 and 愚形待ち
+    return ((20 if exposed_melds else 30)
+            + 2 * (bool(self_draw_bonus) + bool(eyes_bonus) + bool(waiting_bonus)))
@@ -7,11 +7,10 @@ mahjong.shanten
 from argparse import ArgumentParser, Namespace
 from collections import Counter
 from enum import Enum
-from operator import itemgetter
+from functools import lru_cache
 import sys
-from typing import Iterable, Sequence, Union
+from typing import Iterable, List, Sequence, Tuple, Union
 
-from melds import remove_melds, remove_pairs
 import tiles
 
 class ShantenType(Enum):
@@ -22,6 +21,62 @@ class ShantenType(Enum):
     SEVEN_PAIRS = '七対子'
 
 
+@lru_cache(maxsize=1 << 16)
+def _count_melds_pairs_suit(key: bytes) -> Tuple[int, int]:
+    """Return the numbers of melds and pairs removed from a suit part.
+
+    ``key`` is the bytes of a slice of a count vector of a suit. There are
+    about 400,000 such slices of a hand, so the cache is bounded as that of
+    ``count_shanten_std`` is.
+
+    >>> _count_melds_pairs_suit(bytes([0, 0, 1, 0, 0, 0, 0, 1, 2]))
+    (0, 1)
+    >>> _count_melds_pairs_suit(bytes([0, 0, 1, 1, 1, 0, 1, 0, 0]))
+    (1, 0)
+    >>> _count_melds_pairs_suit(bytes([1, 1, 2, 2, 2, 0, 0, 0, 0]))
+    (2, 1)
+    """
+
+    return _scan_melds_pairs_suit(list(key))
+
+
+def _scan_melds_pairs_suit(part: List[int]) -> Tuple[int, int]:
+    """Remove melds and pairs from a suit part in one pass.
+
+    This is the same as ``remove_patterns`` with ``MELD_PATTERNS_NUMBER`` and
+    then with ``PAIR_PATTERNS_NUMBER``. At number ``i`` the Pungs go first,
+    then the Chows from ``i``; the pairs from ``i - 2`` follow, since no meld
+    removed later touches ``i - 2`` to ``i``.
+    """
+
+    num_melds, num_pairs = 0, 0
+    for i in range(11):
+        if i < 9 and (count := part[i]):
+            num_melds += count // 3
+            count %= 3
+            if count and i < 7:
+                chow = min(count, part[i + 1], part[i + 2])
+                count -= chow
+                part[i + 1] -= chow
+                part[i + 2] -= chow
+                num_melds += chow
+            part[i] = count
+
+        j = i - 2
+        if j >= 0 and (count := part[j]):
+            num_pairs += count // 2
+            count %= 2
+            # 両面・辺張 then 嵌張
+            for k in (j + 1, j + 2):
+                if count and k < 9 and part[k]:
+                    part[k] -= 1
+                    count -= 1
+                    num_pairs += 1
+            part[j] = count
+
+    return num_melds, num_pairs
+
+
 def count_shanten_std(player_hand: Union[Counter, Iterable]) -> int:
     """Count the shanten number of player's hand to 4-melds-1-pair form.
 
@@ -51,10 +106,41 @@ def count_shanten_std(player_hand: Union[Counter, Iterable]) -> int:
     8
     """
 
-    if not isinstance(player_hand, Counter):
-        player_hand = Counter(player_hand)
+    return _count_shanten_std_cached(fingerprint(player_hand))
+
+
+def fingerprint(player_hand: Union[Counter, Iterable]) -> bytes:
+    """Return a key of tiles that is the same for the same multiset.
+
+    >>> fingerprint(tiles.tiles('3899m')) == fingerprint(tiles.tiles('9938m'))
+    True
+    >>> fingerprint(tiles.tiles('3899m')) == fingerprint(tiles.tiles('3889m'))
+    False
+    """
+
+    return bytes(tiles.to_vector(player_hand))
+
+
+@lru_cache(maxsize=1 << 16)
+def _count_shanten_std_cached(key: bytes) -> int:
+    """Call count_shanten_std_vector with a fingerprint."""
+    return count_shanten_std_vector(list(key))
+
+
+def count_shanten_std_vector(vector: List[int]) -> int:
+    """Count the shanten number of a count vector to 4-melds-1-pair form.
+
+    This is the body of ``count_shanten_std``. ``vector`` is a list made by
+    ``tiles.to_vector`` and is left untouched.
+
+    >>> count_shanten_std_vector(tiles.to_vector(tiles.tiles('5566m3477p56s')))
+    2
+    """
+
+    num_tile = sum(vector)
+    if num_tile == 14:
+        return count_shanten_std_14(vector)
 
-    num_tile = sum(player_hand.values())
     if num_tile % 3 == 0:
         raise ValueError('the number of tiles must not be 3n.')
 
@@ -62,39 +148,83 @@ def count_shanten_std(player_hand: Union[Counter, Iterable]) -> int:
         # Obvious tempai.
         return 0
     if num_tile == 2:
-        if len(player_hand) == 1:
+        if 2 in vector:
             # XX
             return -1
         # XY
         return 0
 
-    part_m = player_hand & tiles.FILTER_CHARACTERS
-    part_p = player_hand & tiles.FILTER_CIRCLES
-    part_s = player_hand & tiles.FILTER_BAMBOOS
-    part_m, part_p, part_s = (tiles.convert_suit_to_number(suit_part)
-                              for suit_part in (part_m, part_p, part_s))
-
-    melds_m, melds_p, melds_s = (
-        remove_melds(suit_part, tiles. MELDS_NUMBER) for suit_part in (
-            part_m, part_p, part_s))
-    pairs_m, pairs_p, pairs_s = (
-        remove_pairs(suit_part, tiles.PAIRS_NUMBER) for suit_part in (
-            part_m, part_p, part_s))
-
-    hand_h = player_hand & tiles.FILTER_HONORS
-    melds_h = remove_melds(hand_h, tiles.MELDS_HONOR)
-    pairs_h = remove_pairs(hand_h, tiles.PAIRS_HONOR)
+    num_melds, num_pairs = _count_melds_pairs(vector)
 
     # 14, 13, 11, 10, 8, 7, 5, 4 -> 8, 8, 6, 6, 4, 4, 2, 2
     num_shanten = (num_tile - 1) // 3 * 2
-    num_shanten -= sum(len(melds) for melds in (
-        melds_m, melds_p, melds_s, melds_h)) * 2
-    num_shanten -= min(4, sum(len(pairs) for pairs in (
-        pairs_m, pairs_p, pairs_s, pairs_h)))
+    num_shanten -= num_melds * 2
+    num_shanten -= min(4, num_pairs)
 
     return num_shanten
 
 
+def count_shanten_std_14(vector: List[int]) -> int:
+    """Count the shanten number of a count vector of exactly 14 tiles.
+
+    This is ``count_shanten_std_vector`` without the checks on the number of
+    tiles, e.g. for testing a hand just after drawing a tile.
+
+    >>> count_shanten_std_14(tiles.to_vector(tiles.tiles('123456789m123p11s')))
+    -1
+    >>> count_shanten_std_14(tiles.to_vector(tiles.tiles('3899m3457p88s南白発中')))
+    4
+    """
+
+    num_melds, num_pairs = _count_melds_pairs(vector)
+    return 8 - num_melds * 2 - min(4, num_pairs)
+
+
+def _count_melds_pairs(vector: List[int]) -> Tuple[int, int]:
+    """Return the numbers of melds and pairs removed from a count vector."""
+
+    num_melds, num_pairs = 0, 0
+    for part in (vector[tiles.VECTOR_SLICE_CHARACTERS],
+                 vector[tiles.VECTOR_SLICE_CIRCLES],
+                 vector[tiles.VECTOR_SLICE_BAMBOOS]):
+        melds, pairs = _count_melds_pairs_suit(bytes(part))
+        num_melds += melds
+        num_pairs += pairs
+
+    # Honors make neither Chows nor serial pairs.
+    for count in vector[tiles.VECTOR_SLICE_HONORS]:
+        num_melds += count // 3
+        num_pairs += count % 3 // 2
+
+    return num_melds, num_pairs
+
+
+# Bits of the Terminals and Honors, indexed by tile - TILE_RANGE.start
+_ORPHANS_MASK = sum(1 << (tile - tiles.TILE_RANGE.start)
+                    for tile in tiles.THIRTEEN_ORPHANS)
+
+
+def _encode(player_hand: Counter) -> Tuple[int, int]:
+    """Encode tiles as two bitmasks.
+
+    Bit ``tile - TILE_RANGE.start`` of the first mask is set if ``tile`` is
+    in the hand, and that of the second if two or more.
+
+    >>> [bin(mask) for mask in _encode(Counter(tiles.tiles('東南南')))]
+    ['0b11', '0b10']
+    """
+
+    present_mask, pair_mask = 0, 0
+    for tile, count in player_hand.items():
+        if count > 0:
+            bit = 1 << (tile - tiles.TILE_RANGE.start)
+            present_mask |= bit
+            if count >= 2:
+                pair_mask |= bit
+
+    return present_mask, pair_mask
+
+
 def count_shanten_13_orphans(player_hand: Union[Counter, Iterable]) -> int:
     """Count the shanten number of player's hand to Thirteen Orphans
 
@@ -131,8 +261,9 @@ def count_shanten_13_orphans(player_hand: Union[Counter, Iterable]) -> int:
     if sum(player_hand.values()) not in (13, 14):
         raise ValueError('player_hand must be concealed')
 
-    num_orphans = len(orphans := player_hand & tiles.THIRTEEN_ORPHANS)
-    if (player_hand - orphans) & orphans:
+    present_mask, pair_mask = _encode(player_hand)
+    num_orphans = bin(present_mask & _ORPHANS_MASK).count('1')
+    if pair_mask & _ORPHANS_MASK:
         return 12 - num_orphans
 
     return 13 - num_orphans
@@ -173,7 +304,8 @@ def count_shanten_seven_pairs(player_hand: Union[Counter, Iterable]) -> int:
     if sum(player_hand.values()) not in (13, 14):
         raise ValueError('player_hand must be concealed')
 
-    npair = sum(1 for v in player_hand.values() if v >= 2)
+    # A list comprehension runs faster here than sum() over a generator.
+    npair = len([v for v in player_hand.values() if v >= 2])
     # waiting_tiles = tuple(
     #    tile for tile in player_hand if player_hand[tile] < 2)
 
@@ -182,16 +314,29 @@ def count_shanten_seven_pairs(player_hand: Union[Counter, Iterable]) -> int:
 
 def count_shanten_naive(player_hand: Union[Counter, Iterable]) -> int:
     """Count the shanten number of player's hand.
+
+    Return the least shanten number and the function that counts it. On a
+    tie the standard form comes first, then Seven Pairs.
+
+    >>> shanten, func = count_shanten_naive(tiles.tiles('19m19p19s東南西北白発中中'))
+    >>> shanten, func.__name__
+    (-1, 'count_shanten_13_orphans')
+    >>> shanten, func = count_shanten_naive(tiles.tiles('123456789m123p1s'))
+    >>> shanten, func.__name__
+    (0, 'count_shanten_std')
     """
 
     if not isinstance(player_hand, Counter):
         player_hand = Counter(player_hand)
 
-    shanten, func = min(((f(player_hand), f) for f in (
-                        count_shanten_std,
-                        count_shanten_seven_pairs,
-                        count_shanten_13_orphans)),
-                        key=itemgetter(0))
+    shanten, func = count_shanten_std(player_hand), count_shanten_std
+    if shanten < 0:
+        # A winning hand; neither of the others can do better.
+        return shanten, func
+
+    for other in (count_shanten_seven_pairs, count_shanten_13_orphans):
+        if (other_shanten := other(player_hand)) < shanten:
+            shanten, func = other_shanten, other
 
     return shanten, func
 
@@ -4,12 +4,11 @@ mahjong.tiles
 """
 
 from collections import Counter
-from enum import Enum
-from itertools import chain, repeat
-import re
+from enum import IntEnum
+from functools import lru_cache
+from itertools import chain
 import sys
 from typing import Iterable, List, Tuple, Union
-import unicodedata
 
 # | コード | 牌画 | `unicodedata.name` |
 # |-------:|------|:-------------------|
@@ -76,6 +75,49 @@ TILE_RANGE_SUITS = range(0x1F007, 0x1F022)
 
 # 么九牌
 TILE_TERMINALS = (0x1F007, 0x1F00F, 0x1F019, 0x1F021, 0x1F010, 0x1F018)
+_TERMINALS_SET = frozenset(TILE_TERMINALS)
+
+# 中張牌
+_SIMPLES_SET = frozenset(TILE_RANGE_SUITS).difference(TILE_TERMINALS)
+
+# unicodedata.name of the tiles, indexed by tile - TILE_RANGE.start
+_NAME_TABLE = (
+    'MAHJONG TILE EAST WIND',
+    'MAHJONG TILE SOUTH WIND',
+    'MAHJONG TILE WEST WIND',
+    'MAHJONG TILE NORTH WIND',
+    'MAHJONG TILE RED DRAGON',
+    'MAHJONG TILE GREEN DRAGON',
+    'MAHJONG TILE WHITE DRAGON',
+    'MAHJONG TILE ONE OF CHARACTERS',
+    'MAHJONG TILE TWO OF CHARACTERS',
+    'MAHJONG TILE THREE OF CHARACTERS',
+    'MAHJONG TILE FOUR OF CHARACTERS',
+    'MAHJONG TILE FIVE OF CHARACTERS',
+    'MAHJONG TILE SIX OF CHARACTERS',
+    'MAHJONG TILE SEVEN OF CHARACTERS',
+    'MAHJONG TILE EIGHT OF CHARACTERS',
+    'MAHJONG TILE NINE OF CHARACTERS',
+    'MAHJONG TILE ONE OF BAMBOOS',
+    'MAHJONG TILE TWO OF BAMBOOS',
+    'MAHJONG TILE THREE OF BAMBOOS',
+    'MAHJONG TILE FOUR OF BAMBOOS',
+    'MAHJONG TILE FIVE OF BAMBOOS',
+    'MAHJONG TILE SIX OF BAMBOOS',
+    'MAHJONG TILE SEVEN OF BAMBOOS',
+    'MAHJONG TILE EIGHT OF BAMBOOS',
+    'MAHJONG TILE NINE OF BAMBOOS',
+    'MAHJONG TILE ONE OF CIRCLES',
+    'MAHJONG TILE TWO OF CIRCLES',
+    'MAHJONG TILE THREE OF CIRCLES',
+    'MAHJONG TILE FOUR OF CIRCLES',
+    'MAHJONG TILE FIVE OF CIRCLES',
+    'MAHJONG TILE SIX OF CIRCLES',
+    'MAHJONG TILE SEVEN OF CIRCLES',
+    'MAHJONG TILE EIGHT OF CIRCLES',
+    'MAHJONG TILE NINE OF CIRCLES',
+)
+_NAME_TO_ID = dict(zip(_NAME_TABLE, TILE_RANGE))
 
 
 def _define_instances():
@@ -98,11 +140,10 @@ def _define_instances():
     9
     """
 
-    global_namespace = globals()
-    for code in TILE_RANGE:
-        # Convert "MAHJONG TILE XXXX YYYY" to "TILE_XXXX_YYYY"
-        identifier = unicodedata.name(chr(code))[8:].replace(" ", "_")
-        global_namespace[identifier] = code
+    # Convert "MAHJONG TILE XXXX YYYY" to "TILE_XXXX_YYYY"
+    globals().update(
+        (name[8:].replace(" ", "_"), code)
+        for code, name in zip(TILE_RANGE, _NAME_TABLE))
 
 
 _define_instances()
@@ -116,12 +157,19 @@ def get_name(*, tile_id=None, name=None) -> str:
 
     >>> get_name(name='MAHJONG TILE EAST WIND')
     'MAHJONG TILE EAST WIND'
+
+    >>> import unicodedata
+    >>> all(get_name(tile_id=i) == unicodedata.name(chr(i)) for i in TILE_RANGE)
+    True
     """
 
-    if tile_id:
+    if tile_id is not None:
+        if tile_id in TILE_RANGE:
+            return _NAME_TABLE[tile_id - TILE_RANGE.start]
+        import unicodedata
         return unicodedata.name(chr(tile_id))
 
-    if name:
+    if name is not None:
         return name
 
     return None
@@ -135,10 +183,13 @@ def get_id(*, tile_id=None, name=None) -> int:
     True
     """
 
-    if tile_id:
+    if tile_id is not None:
         return tile_id
 
-    if name:
+    if name is not None:
+        if name in _NAME_TO_ID:
+            return _NAME_TO_ID[name]
+        import unicodedata
         return ord(unicodedata.lookup(name))
 
     return None
@@ -155,7 +206,8 @@ def is_honor(tile_id: Tile) -> bool:
     False
     """
 
-    return tile_id in TILE_RANGE_HONORS
+    # The same as tile_id in TILE_RANGE_HONORS
+    return 0x1F000 <= tile_id < 0x1F007
 
 
 def is_wind(tile_id: Tile) -> bool:
@@ -169,7 +221,8 @@ def is_wind(tile_id: Tile) -> bool:
     False
     """
 
-    return tile_id in TILE_RANGE_WINDS
+    # The same as tile_id in TILE_RANGE_WINDS
+    return 0x1F000 <= tile_id < 0x1F004
 
 
 def is_dragon(tile_id: Tile) -> bool:
@@ -183,7 +236,8 @@ def is_dragon(tile_id: Tile) -> bool:
     False
     """
 
-    return tile_id in TILE_RANGE_DRAGONS
+    # The same as tile_id in TILE_RANGE_DRAGONS
+    return 0x1F004 <= tile_id < 0x1F007
 
 
 def is_suit(tile_id: Tile) -> bool:
@@ -201,7 +255,8 @@ def is_suit(tile_id: Tile) -> bool:
     True
     """
 
-    return tile_id in TILE_RANGE_SUITS
+    # The same as tile_id in TILE_RANGE_SUITS
+    return 0x1F007 <= tile_id < 0x1F022
 
 
 def is_character(tile_id: Tile) -> bool:
@@ -219,7 +274,8 @@ def is_character(tile_id: Tile) -> bool:
     False
     """
 
-    return tile_id in TILE_RANGE_CHARACTERS
+    # The same as tile_id in TILE_RANGE_CHARACTERS
+    return 0x1F007 <= tile_id < 0x1F010
 
 
 def is_circle(tile_id: Tile) -> bool:
@@ -237,7 +293,8 @@ def is_circle(tile_id: Tile) -> bool:
     False
     """
 
-    return tile_id in TILE_RANGE_CIRCLES
+    # The same as tile_id in TILE_RANGE_CIRCLES
+    return 0x1F019 <= tile_id < 0x1F022
 
 
 def is_bamboo(tile_id: Tile) -> bool:
@@ -255,7 +312,8 @@ def is_bamboo(tile_id: Tile) -> bool:
     True
     """
 
-    return tile_id in TILE_RANGE_BAMBOOS
+    # The same as tile_id in TILE_RANGE_BAMBOOS
+    return 0x1F010 <= tile_id < 0x1F019
 
 
 def is_terminal(tile_id: Tile) -> bool:
@@ -265,7 +323,7 @@ def is_terminal(tile_id: Tile) -> bool:
     [True, False, False, False, False, False, False, False, True]
     """
 
-    return tile_id in TILE_TERMINALS
+    return tile_id in _TERMINALS_SET
 
 
 def is_simple(tile_id: Tile) -> bool:
@@ -275,7 +333,8 @@ def is_simple(tile_id: Tile) -> bool:
     [False, True, True, True, True, True, True, True, False]
     """
 
-    return is_suit(tile_id) and not is_terminal(tile_id)
+    # is_suit(tile_id) and not is_terminal(tile_id) in one lookup
+    return tile_id in _SIMPLES_SET
 
 
 def get_suit_number(tile_id: Tile) -> int:
@@ -289,19 +348,38 @@ def get_suit_number(tile_id: Tile) -> int:
     3
     """
 
-    if not is_suit(tile_id):
+    if not 0x1F007 <= tile_id < 0x1F022:
         raise ValueError(f'{tile_id} must be a Suit tile')
 
-    return TILE_RANGE_SUITS.index(tile_id) % 9 + 1
+    return (tile_id - 0x1F007) % 9 + 1
 
 
-class TileClass(Enum):
+class TileClass(IntEnum):
     """A simple classification of tiles."""
 
-    CHARACTER = '萬子'
-    CIRCLE = '筒子'
-    BAMBOO = '索子'
-    HONOR = '字牌'
+    CHARACTER = 0
+    CIRCLE = 1
+    BAMBOO = 2
+    HONOR = 3
+
+    def __str__(self) -> str:
+        """Return informal representation
+
+        >>> print(TileClass.CHARACTER)
+        萬子
+        >>> print(TileClass.HONOR)
+        字牌
+        """
+        return ('萬子', '筒子', '索子', '字牌')[self.value]
+
+
+# Tile classes indexed by tile - TILE_RANGE.start
+TILE_CLASS_TABLE = tuple(
+    TileClass.HONOR if is_honor(tile)
+    else TileClass.CHARACTER if is_character(tile)
+    else TileClass.CIRCLE if is_circle(tile)
+    else TileClass.BAMBOO
+    for tile in TILE_RANGE)
 
 
 def get_tile_class(tile_id: Tile) -> TileClass:
@@ -315,17 +393,15 @@ def get_tile_class(tile_id: Tile) -> TileClass:
     True
     >>> get_tile_class(TILE_WHITE_DRAGON) == TileClass.HONOR
     True
+    >>> get_tile_class(TILE_RANGE.start - 1)
+    Traceback (most recent call last):
+        ...
+    ValueError
     """
 
-    mapping = {
-        is_character: TileClass.CHARACTER,
-        is_circle: TileClass.CIRCLE,
-        is_bamboo: TileClass.BAMBOO,
-        is_honor: TileClass.HONOR,}
-
-    for pred, tile_class in mapping.items():
-        if pred(tile_id):
-            return tile_class
+    offset = tile_id - TILE_RANGE.start
+    if 0 <= offset < len(TILE_CLASS_TABLE):
+        return TILE_CLASS_TABLE[offset]
 
     raise ValueError
 
@@ -333,7 +409,7 @@ def get_tile_class(tile_id: Tile) -> TileClass:
 # Filters
 def _create_filter(tile_range):
     """A helper function."""
-    return Counter(chain.from_iterable(repeat(tile_range, 4)))
+    return Counter(dict.fromkeys(tile_range, 4))
 
 FILTER_WINDS = _create_filter(TILE_RANGE_WINDS)
 FILTER_DRAGONS = _create_filter(TILE_RANGE_DRAGONS)
@@ -343,15 +419,15 @@ FILTER_CIRCLES = _create_filter(TILE_RANGE_CIRCLES)
 FILTER_BAMBOOS = _create_filter(TILE_RANGE_BAMBOOS)
 #FILTER_TERMINALS = _create_filter(TILE_TERMINALS)
 
-_mapping_class_filter = {
-    TileClass.CHARACTER: FILTER_CHARACTERS,
-    TileClass.CIRCLE: FILTER_CIRCLES,
-    TileClass.BAMBOO: FILTER_BAMBOOS,
-    TileClass.HONOR: FILTER_HONORS,}
+# Filters indexed by TileClass
+_FILTER_TUPLE = (FILTER_CHARACTERS, FILTER_CIRCLES, FILTER_BAMBOOS, FILTER_HONORS)
 
 def get_filter(tile_class: TileClass):
     """Return the filter from a tile class"""
-    return _mapping_class_filter[tile_class]
+    return _FILTER_TUPLE[tile_class]
+
+# Offsets from the One of a suit
+_digit_table = {str(i): i - 1 for i in range(1, 10)}
 
 _suit_baseid_table = {
     'm': TILE_ONE_OF_CHARACTERS,
@@ -368,9 +444,13 @@ _honor_table = {
     '中': TILE_RED_DRAGON,}
 
 
+@lru_cache(maxsize=2048)
 def tiles(pattern: str) -> Union[int, Tuple]:
     """Transform a string into tile instances.
 
+    The result is cached for each pattern; it is an int or a tuple, hence
+    immutable.
+
     >>> tiles('5s') == TILE_FIVE_OF_BAMBOOS
     True
     >>> tiles('東') == TILE_EAST_WIND
@@ -384,14 +464,20 @@ def tiles(pattern: str) -> Union[int, Tuple]:
     """
 
     result = []
-    regex = r'([1-9]+[mps])|([東南西北白発中]+)'
+    digits = []
+    for char in pattern:
+        if (digit := _digit_table.get(char)) is not None:
+            digits.append(digit)
+            continue
 
-    for suits, honors in re.findall(regex, pattern):
-        if suits:
-            result.extend(_suit_baseid_table[suits[-1]] + int(i) - 1
-                          for i in suits[:-1])
-        else:
-            result.extend(_honor_table[honor] for honor in honors)
+        if digits and char in _suit_baseid_table:
+            base = _suit_baseid_table[char]
+            result.extend([base + i for i in digits])
+        elif char in _honor_table:
+            result.append(_honor_table[char])
+
+        # Digits not followed by a suit are ignored.
+        digits.clear()
 
     if len(result) <= 1:
         if not result:
@@ -401,17 +487,18 @@ def tiles(pattern: str) -> Union[int, Tuple]:
     return tuple(result)
 
 
+# The Markdown table printed by list_tiles_md
+_TILES_MD = '\n'.join(chain(
+    ('| コード | 牌画 | `unicodedata.name` |',
+     '|-------:|------|:-------------------|'),
+    (f'| U+{code:05X} | {chr(code)} | {name} |'
+     for code, name in zip(TILE_RANGE, _NAME_TABLE))))
+
+
 def list_tiles_md(file=sys.stdout):
     """List most Mahjong tiles in Markdown format"""
 
-    # table header
-    print('| コード | 牌画 | `unicodedata.name` |', file=file)
-    print('|-------:|------|:-------------------|', file=file)
-
-    for code in TILE_RANGE:
-        char = chr(code)
-        name = unicodedata.name(char)
-        print(f'| U+{code:05X} | {char} | {name} |', file=file)
+    print(_TILES_MD, file=file)
 
 
 def _init_sortkey_map():
@@ -452,7 +539,7 @@ def sort_tiles(tilelist: List[Tile]):
     True
     """
 
-    tilelist.sort(key=lambda t: SORTKEY_MAP[t])
+    tilelist.sort(key=SORTKEY_MAP.__getitem__)
 
 
 TILE_SUCC_MAP = {
@@ -467,6 +554,9 @@ TILE_SUCC_MAP = {
 
 TILE_PREC_MAP = {TILE_SUCC_MAP[_k]: _k for _k in TILE_SUCC_MAP}
 
+# TILE_SUCC_MAP with the defaults filled in, indexed by tile - TILE_RANGE.start
+_SUCC_TABLE = tuple(TILE_SUCC_MAP.get(code, code + 1) for code in TILE_RANGE)
+
 
 def successor(tile_id: Tile) -> int:
     """Return the dora tile from dora indicator tile.
@@ -499,7 +589,11 @@ def successor(tile_id: Tile) -> int:
     >>> assert successor(TILE_NORTH_WIND) == TILE_EAST_WIND
     """
 
-    return TILE_SUCC_MAP.get(tile_id, tile_id + 1)
+    offset = tile_id - TILE_RANGE.start
+    if 0 <= offset < len(_SUCC_TABLE):
+        return _SUCC_TABLE[offset]
+
+    return tile_id + 1
 
 # Suits
 
@@ -525,6 +619,10 @@ def convert_suit_to_number(player_hand: Union[Counter, Iterable]) -> Counter:
     Traceback (most recent call last):
         ...
     ValueError
+    >>> convert_suit_to_number(tiles('99m1s'))
+    Traceback (most recent call last):
+        ...
+    ValueError
     """
 
     if isinstance(player_hand, Counter):
@@ -535,20 +633,57 @@ def convert_suit_to_number(player_hand: Union[Counter, Iterable]) -> Counter:
     if not source:
         return source
 
-    tile_id = source.most_common(1)[0][0]
-    if tile_id in TILE_RANGE_CHARACTERS:
-        first = TILE_ONE_OF_CHARACTERS
-    elif tile_id in TILE_RANGE_CIRCLES:
-        first = TILE_ONE_OF_CIRCLES
-    elif tile_id in TILE_RANGE_BAMBOOS:
-        first = TILE_ONE_OF_BAMBOOS
-    else:
+    # Any tile tells the suit, since all of them must be of the same suit.
+    suit = (next(iter(source)) - TILE_ONE_OF_CHARACTERS) // 9
+    if not 0 <= suit < 3:
         raise ValueError
 
-    if all(first <= k <= first + 9 for k in source):
-        return Counter({k - first + 1: source[k] for k in source})
+    first = TILE_ONE_OF_CHARACTERS + suit * 9
+    numbers = Counter()
+    for k, v in source.items():
+        if not first <= k < first + 9:
+            raise ValueError
+        numbers[k - first + 1] = v
+
+    return numbers
 
-    raise ValueError
+
+# Count vectors
+
+# Slices of a count vector
+VECTOR_SLICE_HONORS = slice(0, 7)
+VECTOR_SLICE_CHARACTERS = slice(7, 16)
+VECTOR_SLICE_BAMBOOS = slice(16, 25)
+VECTOR_SLICE_CIRCLES = slice(25, 34)
+
+
+def to_vector(player_hand: Union[Counter, Iterable]) -> List[int]:
+    """Convert tiles to the counts of each tile.
+
+    The count of ``tile`` is stored at ``tile - TILE_RANGE.start``. Hence
+    every suit occupies a fixed slice of the vector.
+
+    >>> vector = to_vector(tiles('3899m3457p88s南白発'))
+    >>> len(vector)
+    34
+    >>> vector[VECTOR_SLICE_CHARACTERS]
+    [0, 0, 1, 0, 0, 0, 0, 1, 2]
+    >>> vector[VECTOR_SLICE_HONORS]
+    [0, 1, 0, 0, 0, 1, 1]
+    >>> to_vector(Counter(tiles('88s'))) == to_vector(tiles('88s'))
+    True
+    """
+
+    vector = [0] * len(TILE_RANGE)
+    start = TILE_RANGE.start
+    if isinstance(player_hand, Counter):
+        for tile, count in player_hand.items():
+            vector[tile - start] += count
+    else:
+        for tile in player_hand:
+            vector[tile - start] += 1
+
+    return vector
 
 
 # Melds and pairs
@@ -625,8 +760,34 @@ TRANS_TABLE = str.maketrans({
     0x1F020: '8s',
     0x1F021: '9s',})
 
+# The values of TRANS_TABLE indexed by tile - TILE_RANGE.start
+_FMT_TOKENS = tuple(TRANS_TABLE[code] for code in TILE_RANGE)
+
+
 def format_tiles(*iterable):
-    """Format tiles"""
+    """Format tiles
+
+    >>> format_tiles(tiles('東1m9m'))
+    '1m9m東'
+    """
+
+    start = TILE_RANGE.start
+    return ''.join([_FMT_TOKENS[c - start]
+                    for c in sorted(*iterable, key=SORTKEY_MAP.__getitem__)])
+
+
+def format_counter(player_hand: Counter) -> str:
+    """Format the tiles of a Counter, each repeated by its count.
+
+    This is ``format_tiles(player_hand.elements())`` without expanding the
+    elements; only the distinct tiles are sorted.
+
+    >>> format_counter(Counter(tiles('東1m1m')))
+    '1m1m東'
+    >>> format_tiles(Counter(tiles('東1m1m')))
+    '1m東'
+    """
 
-    sorted_tiles = sorted(*iterable, key=lambda t: SORTKEY_MAP[t])
-    return ''.join(chr(c) for c in sorted_tiles).translate(TRANS_TABLE)
+    start = TILE_RANGE.start
+    return ''.join([_FMT_TOKENS[c - start] * player_hand[c]
+                    for c in sorted(player_hand, key=SORTKEY_MAP.__getitem__)])
@@ -23,8 +23,13 @@ class TileWallAgent:
     14
     """
 
+    __slots__ = ('num_revealed_tiles', 'dead_wall', 'live_wall')
+
     DEAD_WALL_SIZE = 14
 
+    # All the 136 tiles, four of each
+    _ALL_TILES = tuple(chain.from_iterable(repeat(tiles.TILE_RANGE, 4)))
+
     def __init__(self):
         self.num_revealed_tiles = 0
         self.dead_wall = None
@@ -45,7 +50,7 @@ class TileWallAgent:
         """Shuffle all tiles and build the wall.
         """
 
-        all_tiles = list(chain.from_iterable(repeat(tiles.TILE_RANGE, 4)))
+        all_tiles = list(self._ALL_TILES)
         shuffle(all_tiles)
         self.dead_wall = all_tiles[:self.DEAD_WALL_SIZE]
         self.live_wall = all_tiles[self.DEAD_WALL_SIZE:]
@@ -70,20 +75,22 @@ class TileWallAgent:
     def _do_initial_deal(self, num_player=4):
         """Let the players take 13 tiles"""
 
-        num_tiles_took = 4
-        curpos = -1
-
+        # Take tiles from the end of the live wall and cut it off once at
+        # the end, rather than deleting each part taken.
+        top = len(self.live_wall)
         player_hands = [list() for _ in range(num_player)]
 
-        took_part = slice(curpos, curpos - num_tiles_took, -1)
+        num_tiles_took = 4
         for _ in range(3):
             for player_hand in player_hands:
-                player_hand.extend(self.live_wall[took_part])
-                del self.live_wall[took_part]
+                player_hand.extend(
+                    reversed(self.live_wall[top - num_tiles_took:top]))
+                top -= num_tiles_took
 
-        num_tiles_took = 1
         for player_hand in player_hands:
-            player_hand.append(self.live_wall[-1])
-            self.live_wall.pop()
+            top -= 1
+            player_hand.append(self.live_wall[top])
+
+        del self.live_wall[top:]
 
         return player_hands
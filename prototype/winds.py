@@ -42,7 +42,16 @@ class Winds(IntEnum):
         >>> print(Winds.NORTH)
         北
         """
-        return '東南西北'[int(self.value)]
+        return _WIND_LABELS[self]
+
+
+_WIND_LABELS = ('東', '南', '西', '北')
+
+# The left and the right winds indexed by a wind
+_LEFT_WINDS = (Winds.NORTH, Winds.EAST, Winds.SOUTH, Winds.WEST)
+_RIGHT_WINDS = (Winds.SOUTH, Winds.WEST, Winds.NORTH, Winds.EAST)
+
+_ALL_WINDS = (Winds.EAST, Winds.SOUTH, Winds.WEST, Winds.NORTH)
 
 
 def get_left_wind(wind: Winds) -> Winds:
@@ -52,7 +61,7 @@ def get_left_wind(wind: Winds) -> Winds:
     北
     """
 
-    return Winds((wind.value - 1) % 4)
+    return _LEFT_WINDS[wind]
 
 def get_right_wind(wind: Winds) -> Winds:
     """Return the right wind
@@ -61,7 +70,7 @@ def get_right_wind(wind: Winds) -> Winds:
     東
     """
 
-    return Winds((wind.value + 1) % 4)
+    return _RIGHT_WINDS[wind]
 
 
 def wind_from_dice(
@@ -83,4 +92,5 @@ def wind_from_dice(
     if dice and not dice_sum:
         dice_sum = sum(dice)
 
-    return Winds((dice_sum - 1) % 4)
+    # & 3 is % 4 for any int
+    return _ALL_WINDS[(dice_sum - 1) & 3]